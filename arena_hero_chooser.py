@@ -20,8 +20,18 @@
 # Modified:    2021-06-13
 # Description: A script that will randomly generate two PvP teams for Arena: The Contest.
 
-import random
+import sys
+from collections import defaultdict
+from functools import total_ordering
+from operator import attrgetter
 from os import path
+from random import randrange as _rrandrange
+
+# d20 rolls that are read with "an" rather than "a" (an 8, an 11, an 18)
+_AN_ROLLS = frozenset((8, 11, 18))
+
+# sort key for ordering Teams by roll without going through their comparison methods
+_roll_key = attrgetter('_roll')
 
 
 class PathNotSetError(Exception):
@@ -31,6 +41,7 @@ class PathNotSetError(Exception):
     pass
 
 
+@total_ordering
 class Team:
     """
     A team belonging to a player. May have 3 or 4 heroes.
@@ -41,6 +52,10 @@ class Team:
     _possible_heroes = None       # initialized when first class instance is created
     _team_size = 3                # should only be changed by the set_team_size class method
     _allow_special_class = True   # should only be changed by the disallow_special class method
+    _class_keys = ()              # snapshot of the classes in _possible_heroes that new Teams copy their classes from
+
+    # Instance variables (slotted, since Teams need no __dict__):
+    __slots__ = ('_name', '_roll', '_possible_classes', '_heroes')
 
     @classmethod
     def get_team_size(cls) -> int:
@@ -70,6 +85,7 @@ class Team:
 
         :raises PathNotSetError: if cls._hero_file_path was not set
         :raises FileNotFoundError: if path to filename doesn't exist
+        :raises ValueError: if a non-blank line in the file isn't formatted as "hero name, hero class"
         """
 
         if not cls._hero_file_path:
@@ -77,21 +93,20 @@ class Team:
         elif not path.isfile(cls._hero_file_path):
             raise FileNotFoundError
         else:
-            all_heroes = {}
+            # the file is small, so read it in one go and split each non-blank line into (hero, ", ", class)
             with open(cls._hero_file_path, 'r') as hero_file:
-                for line in hero_file:
-                    heroes = line.split(", ")
-                    hero_name = heroes[0]
-                    hero_class = heroes[1].strip('\n')
-                    # match the hero with its class
-                    try:
-                        # add the hero to its associated class list (if it's not the first hero of that class)
-                        all_heroes[hero_class].append(hero_name)
-                    except KeyError:
-                        # create a list to store heroes of that class if this is the first hero
-                        all_heroes[hero_class] = [hero_name]
-
-            cls._possible_heroes = all_heroes
+                hero_lines = [line.partition(", ") for line in hero_file.read().splitlines() if line.strip()]
+
+            heroes_by_class = defaultdict(list)  # copied into a plain dict below, so missing classes can't be added
+            for hero_name, separator, hero_class in hero_lines:
+                if not separator:
+                    raise ValueError(f"expected a line formatted as \"hero name, hero class\", got {hero_name!r}")
+                # add the hero to its class list, creating the list if this is the first hero of that class
+                heroes_by_class[hero_class].append(hero_name)
+
+            # interned class names can be looked up and compared (e.g. against "Special") by pointer
+            cls._possible_heroes = {sys.intern(hero_class): heroes for hero_class, heroes in heroes_by_class.items()}
+            cls._class_keys = tuple(cls._possible_heroes)
 
     @classmethod
     def disallow_special(cls):
@@ -105,6 +120,7 @@ class Team:
             cls._allow_special_class = False      # prevent special class from being added to possible_heroes
         if cls._possible_heroes and "Special" in cls._possible_heroes:
             del(cls._possible_heroes["Special"])  # remove special class from possible_heroes if it was already added
+            cls._class_keys = tuple(cls._possible_heroes)
 
     @classmethod
     def set_team_size(cls, team_size):
@@ -140,11 +156,11 @@ class Team:
         # remove the special class from consideration if disallow_special() was previously called and
         # the special class is somehow still among the possible_heroes to be chosen
         if not self._allow_special_class and "Special" in self._possible_heroes:
-            del(self._possible_heroes["Special"])
+            self.disallow_special()
 
         self._name = team_name
-        self._roll = random.randint(1, 20)  # roll a d20
-        self._possible_classes = list(self._possible_heroes.keys())
+        self._roll = 1 + _rrandrange(20)  # roll a d20
+        self._possible_classes = list(self._class_keys)
         self._heroes = []  # len(self._heroes) should never exceed cls.team_size
 
     def get_name(self) -> str:
@@ -154,14 +170,14 @@ class Team:
         return self._roll
 
     def print_roll(self):
-        a_or_an = "an" if self._roll in {8, 11, 18} else 'a'
+        a_or_an = "an" if self._roll in _AN_ROLLS else 'a'
         print(f"{self._name} rolled {a_or_an} {self._roll}")
 
     def reroll(self):
         """
         Sets self._roll to a random integer between 1 and 20, mimicking a d20 dice roll
         """
-        self._roll = random.randint(1, 20)
+        self._roll = 1 + _rrandrange(20)
 
     def choose_hero(self):
         """
@@ -172,37 +188,63 @@ class Team:
 
         Removes the chosen hero from cls._possible_heroes and the chosen class from self._possible_classes.
         Adds the chosen hero to self._heroes.
-        """
-        # weight random choice of class by num of heroes in each class, prevent choosing from an empty list
-        keys_to_choose_from = [key for key in self._possible_classes for _ in self._possible_heroes[key]]
 
-        # choose a hero and add it to self.heroes
-        key = random.choice(keys_to_choose_from)
-        hero = random.choice(self._possible_heroes[key])
+        :raises IndexError: if none of this Team's possible classes have any heroes left
+        """
+        # weight random choice of class by num of heroes in each class; the pool is shared with the other team, so
+        # the weights are read fresh on every pick (it's only one length per class)
+        weights = [len(self._possible_heroes[key]) for key in self._possible_classes]
+        total = sum(weights)
+        if not total:
+            raise IndexError("there are no heroes left for this team to choose from")
+
+        # choose one of the heroes this team may still pick uniformly at random, then walk the weights to find its
+        # class (empty classes are skipped) and its position within that class
+        target = _rrandrange(total)
+        for i, weight in enumerate(weights):
+            if target < weight:
+                break
+            target -= weight
+        key = self._possible_classes[i]
+
+        # add the chosen hero to self.heroes
+        heroes_of_class = self._possible_heroes[key]
+        hero = heroes_of_class[target]
         self._heroes.append(hero)
 
-        # prevent this team from choosing another hero of the same class
-        self._possible_classes.remove(key)
+        # prevent this team from choosing another hero of the same class (the weights are rebuilt from
+        # _possible_classes on every pick, so its order doesn't matter either: swap it with the last class and pop)
+        self._possible_classes[i] = self._possible_classes[-1]
+        self._possible_classes.pop()
 
-        # prevent any team from choosing the same hero
-        self._possible_heroes[key].remove(hero)
+        # prevent any team from choosing the same hero (order within a class doesn't matter, so swap it with the last
+        # hero and pop)
+        heroes_of_class[target] = heroes_of_class[-1]
+        heroes_of_class.pop()
 
+    # Teams are only ever compared with Teams, so compare rolls directly and only bail out if other has no roll;
+    # total_ordering fills in __gt__, __le__ and __ge__ from __lt__ and __eq__.
     def __lt__(self, other):
-        return self._roll < other._roll if isinstance(other, Team) else NotImplemented
-
-    def __gt__(self, other):
-        return self._roll > other._roll if isinstance(other, Team) else NotImplemented
+        try:
+            other_roll = other._roll
+        except AttributeError:
+            return NotImplemented
+        return self._roll < other_roll
 
     def __eq__(self, other):
-        return self._roll == other._roll if isinstance(other, Team) else NotImplemented
+        try:
+            other_roll = other._roll
+        except AttributeError:
+            return NotImplemented
+        return self._roll == other_roll
 
     def __str__(self):
         return self._name + "\'s team:\n" + '\n'.join(self._heroes)
 
     def __repr__(self):
-        return f"Team(_possible_heroes={self._possible_heroes}, _team_size={self._team_size}, " \
-               f"_allow_special_class={self._allow_special_class}, _name={self._name}, _roll = {self._roll} " \
-               f"_possible_classes={self._possible_classes}, _heroes={self._heroes})"
+        return (f"Team(_possible_heroes={self._possible_heroes}, _team_size={self._team_size}, "
+                f"_allow_special_class={self._allow_special_class}, _name={self._name}, _roll={self._roll}, "
+                f"_possible_classes={self._possible_classes}, _heroes={self._heroes})")
 
 
 if __name__ == '__main__':
@@ -260,12 +302,14 @@ if __name__ == '__main__':
     team_1.print_roll()
     team_2.print_roll()
     print("")
-    print(max(team_1, team_2).get_name() + "\'s team picks first.")
+    first_team = max((team_1, team_2), key=_roll_key)
+    second_team = min((team_1, team_2), key=_roll_key)
+    print(first_team.get_name() + "\'s team picks first.")
 
     # fill each team with heroes, alternating between them
     for i in range(Team.get_team_size()):
-        max(team_1, team_2).choose_hero()
-        min(team_1, team_2).choose_hero()
+        first_team.choose_hero()
+        second_team.choose_hero()
 
     # output teams
     print("")